@@ -1,36 +1,115 @@
 """
 Test suite for the High School Management System API
 """
+from functools import lru_cache
+from urllib.parse import quote
+
 import pytest
 from fastapi.testclient import TestClient
 from src.app import app, activities
 
 
-@pytest.fixture
+@lru_cache(maxsize=None)
+def _activity_url(activity, action, email=None):
+    """Build an encoded activity endpoint URL, with an optional email query"""
+    url = f"/activities/{quote(activity)}/{action}"
+    if email is not None:
+        url += f"?email={quote(email)}"
+    return url
+
+
+def signup_url(activity, email=None):
+    """URL for signing up for an activity"""
+    return _activity_url(activity, "signup", email)
+
+
+def unregister_url(activity, email=None):
+    """URL for unregistering from an activity"""
+    return _activity_url(activity, "unregister", email)
+
+
+CHESS_SIGNUP = signup_url("Chess Club")
+CHESS_UNREGISTER = unregister_url("Chess Club")
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
-
-
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        name: {
-            "description": details["description"],
-            "schedule": details["schedule"],
-            "max_participants": details["max_participants"],
-            "participants": details["participants"].copy()
-        }
+    """Create a single test client for the FastAPI app, shared across the session"""
+    # Entering the client runs the lifespan once and keeps one event loop
+    # portal open, instead of starting a new one for every request.
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def original_participants():
+    """Snapshot the participants at session start and restore them at the end"""
+    # autouse forces the snapshot before the first test runs, so a test that
+    # mutates state without requesting reset_activities cannot leak into it.
+    # Only the participants lists are mutated by the API, so nothing else
+    # needs restoring.
+    snapshot = {
+        name: list(details["participants"])
         for name, details in activities.items()
     }
+    yield snapshot
     
+    # reset_activities only restores in setup, so undo whatever the last
+    # mutating test left behind before the session ends.
+    _restore_participants(snapshot)
+
+
+def _restore_participants(snapshot):
+    """Put every activity's participants back to the snapshot"""
+    for name, participants in snapshot.items():
+        activities[name]["participants"] = list(participants)
+
+
+@pytest.fixture
+def reset_activities(original_participants):
+    """Restore the original participants before a test that mutates them"""
+    # Tests that do not request this fixture may see state left behind by an
+    # earlier mutating test; only the session teardown cleans that up.
+    _restore_participants(original_participants)
     yield
+
+
+def _fetch_activities(client):
+    """GET /activities once and return the decoded JSON body"""
+    response = client.get("/activities")
+    assert response.status_code == 200
+    return response.json()
+
+
+# (activity, email) signups that start the happy-path flows. Each one is
+# checked by test_signup_then_registered and set up by the signed_up fixture.
+SIGNUP_CASES = [
+    ("Chess Club", "signedup@mergington.edu"),
+    ("Soccer Team", "integration@mergington.edu"),
+]
+
+
+def _sign_up(client, activity, email):
+    """POST a signup and assert it succeeded and registered the participant"""
+    response = client.post(signup_url(activity, email))
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert "message" in data
+    assert email in data["message"]
+    assert activity in data["message"]
     
-    # Restore original state after test
-    for name, details in original_activities.items():
-        activities[name]["participants"] = details["participants"].copy()
+    # Verify participant was added
+    assert email in activities[activity]["participants"]
+
+
+@pytest.fixture
+def signed_up(request, client, reset_activities):
+    """Sign up a participant and return the (activity, email) pair"""
+    # Defaults to the first signup case; parametrize indirectly to pick another.
+    activity, email = getattr(request, "param", SIGNUP_CASES[0])
+    _sign_up(client, activity, email)
+    return activity, email
 
 
 class TestRootEndpoint:
@@ -46,12 +125,9 @@ class TestRootEndpoint:
 class TestGetActivities:
     """Tests for getting all activities"""
     
-    def test_get_activities_returns_all_activities(self, client):
-        """Test that GET /activities returns all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        
-        data = response.json()
+    def test_get_activities(self, client):
+        """Test that GET /activities returns all expected activities"""
+        data = _fetch_activities(client)
         assert isinstance(data, dict)
         assert len(data) > 0
         
@@ -62,11 +138,6 @@ class TestGetActivities:
             assert "max_participants" in details
             assert "participants" in details
             assert isinstance(details["participants"], list)
-    
-    def test_get_activities_includes_expected_activities(self, client):
-        """Test that response includes expected activities"""
-        response = client.get("/activities")
-        data = response.json()
         
         # Check for some expected activities
         assert "Chess Club" in data
@@ -74,81 +145,44 @@ class TestGetActivities:
         assert "Programming Class" in data
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestSignupForActivity:
     """Tests for signing up for activities"""
     
-    def test_signup_for_valid_activity(self, client):
+    @pytest.mark.parametrize("activity,email", SIGNUP_CASES)
+    def test_signup_then_registered(self, client, activity, email):
         """Test successful signup for an activity"""
-        response = client.post(
-            "/activities/Chess%20Club/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "message" in data
-        assert "test@mergington.edu" in data["message"]
-        assert "Chess Club" in data["message"]
-        
-        # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "test@mergington.edu" in activities_data["Chess Club"]["participants"]
-    
-    def test_signup_for_nonexistent_activity(self, client):
-        """Test signup for activity that doesn't exist"""
-        response = client.post(
-            "/activities/Nonexistent%20Club/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        
-        data = response.json()
-        assert "detail" in data
-        assert "not found" in data["detail"].lower()
+        _sign_up(client, activity, email)
     
     def test_signup_duplicate_participant(self, client):
         """Test that duplicate signup is rejected"""
         email = "duplicate@mergington.edu"
         
         # First signup should succeed
-        response1 = client.post(
-            f"/activities/Chess%20Club/signup?email={email}"
-        )
+        response1 = client.post(signup_url("Chess Club", email))
         assert response1.status_code == 200
         
         # Second signup should fail
-        response2 = client.post(
-            f"/activities/Chess%20Club/signup?email={email}"
-        )
+        response2 = client.post(signup_url("Chess Club", email))
         assert response2.status_code == 400
         
         data = response2.json()
         assert "detail" in data
         assert "already signed up" in data["detail"].lower()
-    
-    def test_signup_without_email(self, client):
-        """Test signup without providing email"""
-        response = client.post("/activities/Chess%20Club/signup")
-        assert response.status_code == 422  # Validation error
 
 
 class TestUnregisterFromActivity:
     """Tests for unregistering from activities"""
     
-    def test_unregister_existing_participant(self, client):
+    def test_unregister_existing_participant(self, client, signed_up):
         """Test successful unregistration of a participant"""
-        # First, sign up a participant
-        email = "unregister@mergington.edu"
-        client.post(f"/activities/Chess%20Club/signup?email={email}")
+        activity, email = signed_up
         
         # Verify they are registered
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data["Chess Club"]["participants"]
+        assert email in activities[activity]["participants"]
         
         # Now unregister
-        response = client.delete(
-            f"/activities/Chess%20Club/unregister?email={email}"
-        )
+        response = client.delete(unregister_url(activity, email))
         assert response.status_code == 200
         
         data = response.json()
@@ -157,90 +191,89 @@ class TestUnregisterFromActivity:
         assert "Unregistered" in data["message"]
         
         # Verify they are no longer registered
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email not in activities_data["Chess Club"]["participants"]
-    
-    def test_unregister_from_nonexistent_activity(self, client):
-        """Test unregistering from activity that doesn't exist"""
-        response = client.delete(
-            "/activities/Nonexistent%20Club/unregister?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        
-        data = response.json()
-        assert "detail" in data
-        assert "not found" in data["detail"].lower()
+        assert email not in activities[activity]["participants"]
     
     def test_unregister_participant_not_registered(self, client):
         """Test unregistering participant who is not registered"""
         response = client.delete(
-            "/activities/Chess%20Club/unregister?email=notregistered@mergington.edu"
+            unregister_url("Chess Club", "notregistered@mergington.edu")
         )
         assert response.status_code == 400
         
         data = response.json()
         assert "detail" in data
         assert "not signed up" in data["detail"].lower()
+
+
+class TestInvalidRequests:
+    """Tests for requests rejected by both signup and unregister"""
+    
+    @pytest.mark.parametrize("method,url", [
+        ("post", signup_url("Nonexistent Club", "test@mergington.edu")),
+        ("delete", unregister_url("Nonexistent Club", "test@mergington.edu")),
+    ])
+    def test_nonexistent_activity(self, client, method, url):
+        """Test signup/unregister for activity that doesn't exist"""
+        response = getattr(client, method)(url)
+        assert response.status_code == 404
+        
+        data = response.json()
+        assert "detail" in data
+        assert "not found" in data["detail"].lower()
     
-    def test_unregister_without_email(self, client):
-        """Test unregister without providing email"""
-        response = client.delete("/activities/Chess%20Club/unregister")
+    @pytest.mark.parametrize("method,url", [
+        ("post", CHESS_SIGNUP),
+        ("delete", CHESS_UNREGISTER),
+    ])
+    def test_without_email(self, client, method, url):
+        """Test signup/unregister without providing email"""
+        response = getattr(client, method)(url)
         assert response.status_code == 422  # Validation error
 
 
 class TestIntegrationScenarios:
     """Integration tests for complete workflows"""
     
-    def test_complete_signup_and_unregister_flow(self, client):
+    @pytest.mark.parametrize(
+        "signed_up", [SIGNUP_CASES[1]], indirect=True, ids=["Soccer Team"]
+    )
+    def test_complete_signup_and_unregister_flow(
+        self, client, signed_up, original_participants
+    ):
         """Test complete flow of signing up and unregistering"""
-        email = "integration@mergington.edu"
-        activity = "Soccer Team"
-        
-        # Get initial participant count
-        response = client.get("/activities")
-        initial_count = len(response.json()[activity]["participants"])
-        
-        # Sign up
-        signup_response = client.post(
-            f"/activities/{activity}/signup?email={email}"
-        )
-        assert signup_response.status_code == 200
+        activity, email = signed_up
+        initial_count = len(original_participants[activity])
         
         # Verify count increased
-        response = client.get("/activities")
-        new_count = len(response.json()[activity]["participants"])
+        new_count = len(activities[activity]["participants"])
         assert new_count == initial_count + 1
         
         # Unregister
-        unregister_response = client.delete(
-            f"/activities/{activity}/unregister?email={email}"
-        )
+        unregister_response = client.delete(unregister_url(activity, email))
         assert unregister_response.status_code == 200
         
         # Verify count is back to original
-        response = client.get("/activities")
-        final_count = len(response.json()[activity]["participants"])
+        final_count = len(activities[activity]["participants"])
         assert final_count == initial_count
     
-    def test_multiple_participants_signup(self, client):
-        """Test multiple participants signing up for same activity"""
+    @pytest.mark.usefixtures("reset_activities")
+    def test_multiple_participants_signup(self, client, original_participants):
+        """Test several participants signing up for the same activity"""
         activity = "Art Studio"
         emails = [
             "participant1@mergington.edu",
             "participant2@mergington.edu",
-            "participant3@mergington.edu"
+            "participant3@mergington.edu",
         ]
         
         # Sign up all participants
         for email in emails:
-            response = client.post(
-                f"/activities/{activity}/signup?email={email}"
-            )
+            response = client.post(signup_url(activity, email))
             assert response.status_code == 200
         
-        # Verify all are registered
-        response = client.get("/activities")
-        participants = response.json()[activity]["participants"]
-        for email in emails:
-            assert email in participants
+        # Verify all are registered alongside the existing members
+        participants = activities[activity]["participants"]
+        assert set(emails).issubset(participants)
+        assert len(participants) == (
+            len(original_participants[activity]) + len(emails)
+        )